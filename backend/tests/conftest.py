@@ -0,0 +1,46 @@
+"""Base SQLite temporal y almacén de archivos en una carpeta temporal para las pruebas.
+
+Así ninguna prueba toca la base configurada en .env ni backend/uploads.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_carpeta = tempfile.mkdtemp(prefix="pruebas_")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(_carpeta, "pruebas.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="module")
+def base():
+    """Tablas vacías para el módulo; se borran al terminar."""
+    import main
+    with main.app.app_context():
+        main.db.create_all()
+    yield main.db
+    with main.app.app_context():
+        main.db.session.remove()
+        main.db.drop_all()
+
+
+@pytest.fixture
+def almacen(tmp_path, monkeypatch):
+    """uploads/ en una carpeta temporal; sin optimización en segundo plano salvo que la prueba la active."""
+    import main
+    monkeypatch.setattr(main.app, "root_path", str(tmp_path))
+    monkeypatch.setattr(main, "CARPETA_UPLOADS", str(tmp_path / "uploads"))
+    monkeypatch.setattr(main, "CARPETA_BLOBS", str(tmp_path / "uploads" / "blobs"))
+    monkeypatch.setattr(main, "CARPETA_SUBIDAS", str(tmp_path / "uploads" / "subidas"))
+    monkeypatch.setattr(main, "OPTIMIZAR_ARCHIVOS", False)
+    return tmp_path
+
+
+@pytest.fixture
+def cliente_app(base):
+    import main
+    main.app.config["TESTING"] = True
+    with main.app.app_context():
+        yield main.app.test_client()
+        main.db.session.rollback()
@@ -0,0 +1,109 @@
+"""Almacén de archivos por contenido: deduplicación, historial por ruta y migración.
+
+    cd backend && python -m pytest tests
+"""
+import io
+import os
+
+from werkzeug.datastructures import FileStorage
+
+import main
+from main import Blob, HistorialPlaca, Placas, ReferenciaArchivo, Unidades, db
+
+
+def _archivo(contenido, nombre="documento.txt"):
+    return FileStorage(stream=io.BytesIO(contenido), filename=nombre)
+
+
+def _blobs_en_disco(carpeta):
+    return sorted(f for _, _, archivos in os.walk(carpeta) for f in archivos)
+
+
+def test_mismo_contenido_se_guarda_una_vez(cliente_app, almacen):
+    primera = main.guardar_blob(_archivo(b"contenido repetido", "a.txt"))
+    segunda = main.guardar_blob(_archivo(b"contenido repetido", "otro_nombre.txt"))
+    distinta = main.guardar_blob(_archivo(b"otro contenido", "a.txt"))
+
+    assert primera == segunda != distinta
+    assert primera.startswith(main.PREFIJO_BLOB)
+    assert len(_blobs_en_disco(main.CARPETA_BLOBS)) == 2  # sin temporales .parcial
+    assert db.session.get(Blob, main.sha_de_url(primera)).tamano == len(b"contenido repetido")
+
+
+def test_extension_del_cliente_se_sanea(cliente_app, almacen):
+    assert main.extension_segura("foto.JPG") == ".jpg"
+    assert main.extension_segura("../../x.pdf") == ".pdf"
+    assert main.extension_segura("sin_extension") == ""
+    assert main.extension_segura("a." + "x" * 40) == ""
+    assert main.extension_segura("a.p$f") == ".pf"  # secure_filename quita lo que no es seguro
+
+    url = main.guardar_blob(_archivo(b"nombre raro", "a." + "x" * 40))
+    assert os.path.splitext(url)[1] == ""
+    assert db.session.get(Blob, main.sha_de_url(url)).extension == ""
+
+
+def test_historial_copia_la_ruta_sin_tocar_el_disco(cliente_app, almacen):
+    url = main.guardar_blob(_archivo(b"placa frontal", "frontal.txt"))
+    db.session.add(Unidades(id_unidad=501, marca="Marca", vehiculo="Prueba", id_empresa=1))
+    placa = Placas(id_placa=501, id_unidad=501, placa="HIST501", url_placa_frontal=url)
+    db.session.add(placa)
+    db.session.commit()
+
+    # Pasar al historial es copiar la ruta; la placa activa recibe otro archivo
+    db.session.add(HistorialPlaca(id_placa=501, id_unidad=501, placa="HIST501", url_placa_frontal=url))
+    placa.url_placa_frontal = main.guardar_blob(_archivo(b"placa nueva", "frontal.txt"))
+    db.session.commit()
+
+    assert os.path.isfile(main.ruta_absoluta(url))
+    referencias = ReferenciaArchivo.query.filter_by(sha256=main.sha_de_url(url)).all()
+    assert [(r.tabla, r.columna) for r in referencias] == [(HistorialPlaca.__tablename__, "url_placa_frontal")]
+
+
+def test_migrar_conserva_el_slash_inicial(cliente_app, almacen):
+    carpeta = almacen / "uploads" / "garantias"
+    carpeta.mkdir(parents=True)
+    (carpeta / "poliza.pdf").write_bytes(b"%PDF poliza")
+    (carpeta / "factura.pdf").write_bytes(b"%PDF factura")
+    db.session.add(main.Garantias(id_garantia=601, id_unidad=601, url_poliza="/uploads/garantias/poliza.pdf"))
+    db.session.add(Unidades(id_unidad=601, marca="Marca", vehiculo="Migrada", id_empresa=1,
+                            url_factura="uploads/garantias/factura.pdf"))
+    db.session.commit()
+
+    resultado = main.app.test_cli_runner().invoke(main.migrar_archivos, [])
+    assert resultado.exit_code == 0, resultado.output
+
+    db.session.expire_all()
+    poliza = db.session.get(main.Garantias, 601).url_poliza
+    factura = db.session.get(Unidades, 601).url_factura
+    assert poliza.startswith("/" + main.PREFIJO_BLOB)
+    assert factura.startswith(main.PREFIJO_BLOB)
+    assert os.path.isfile(main.ruta_absoluta(poliza))
+
+
+def test_optimizar_despues_del_commit_reapunta_solo_las_referencias(cliente_app, almacen, monkeypatch):
+    from PIL import Image
+    monkeypatch.setattr(main, "encolar_miniatura", lambda url: None)
+    encoladas = []
+    monkeypatch.setattr(main, "encolar_optimizacion", encoladas.append)
+
+    imagen = io.BytesIO()
+    Image.frombytes("RGB", (300, 300), os.urandom(300 * 300 * 3)).save(imagen, "JPEG", quality=100)
+    url = main.guardar_blob(_archivo(imagen.getvalue(), "foto.jpg"))
+    sha = main.sha_de_url(url)
+    assert encoladas == []  # nada lo referencia todavía
+
+    db.session.add(Unidades(id_unidad=701, marca="Marca", vehiculo="Optimizada", id_empresa=1, url_foto=url))
+    db.session.add(Placas(id_placa=701, id_unidad=701, placa="OPT701", url_placa_frontal="/" + url))
+    db.session.commit()
+    assert encoladas == [sha]
+
+    nueva = main.optimizar_blob(sha)
+    assert nueva and nueva != url
+    assert os.path.getsize(main.ruta_absoluta(nueva)) < os.path.getsize(main.ruta_absoluta(url))
+
+    db.session.expire_all()
+    assert db.session.get(Unidades, 701).url_foto == nueva
+    assert db.session.get(Placas, 701).url_placa_frontal == "/" + nueva
+    referencias = ReferenciaArchivo.query.filter(ReferenciaArchivo.id_fila == 701).all()
+    assert {r.sha256 for r in referencias} == {main.sha_de_url(nueva)}
+    assert db.session.get(Blob, sha).sha256_optimizado == main.sha_de_url(nueva)
@@ -0,0 +1,56 @@
+"""Bandeja de salida: los correos con enlaces de acceso no guardan el secreto en la fila.
+
+    cd backend && python -m pytest tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import main
+from main import CorreoSalida, Usuarios, db
+
+
+@pytest.fixture
+def correo_silenciado(cliente_app, monkeypatch):
+    """Flask-Mail registra los mensajes en lugar de mandarlos."""
+    monkeypatch.setattr(main.app.extensions["mail"], "suppress", True)
+    with main.mail.record_messages() as enviados:
+        yield enviados
+
+
+def _usuario(n):
+    usuario = Usuarios(nombre=f"Prueba {n}", usuario=f"prueba{n}", contraseña="x",
+                       correo=f"prueba{n}@ejemplo.com", rol="usuario")
+    db.session.add(usuario)
+    return usuario
+
+
+def test_recuperacion_encola_sin_token_y_lo_arma_al_enviar(cliente_app, correo_silenciado):
+    usuario = _usuario(1)
+    db.session.commit()
+
+    respuesta = cliente_app.post("/request-reset", json={"email": usuario.correo})
+    assert respuesta.status_code == 200
+
+    correo = CorreoSalida.query.filter_by(plantilla="recuperacion").one()
+    token = usuario.token_recuperacion
+    assert token and correo.id_usuario == usuario.id_usuario
+    assert correo.cuerpo_html is None and correo.cuerpo_texto is None
+
+    assert main.enviar_correos_pendientes() == (1, 0)
+    assert len(correo_silenciado) == 1
+    assert f"/reset-password/{token}" in correo_silenciado[0].html
+    assert correo.estado == "enviado"
+
+
+def test_enlace_vencido_no_se_envia(cliente_app, correo_silenciado):
+    usuario = _usuario(2)
+    main.encolar_correo_plantilla("alta_usuario", usuario, main.PLAZO_ENLACE_ALTA)
+    db.session.commit()
+    usuario.token_expiracion = datetime.utcnow() - timedelta(minutes=1)
+    db.session.commit()
+
+    assert main.enviar_correos_pendientes() == (0, 1)
+    assert correo_silenciado == []
+    correo = CorreoSalida.query.filter_by(id_usuario=usuario.id_usuario).one()
+    assert correo.estado == "fallido"
@@ -0,0 +1,66 @@
+"""Expediente en ZIP: archivos de la unidad y manifiesto.csv con incluidos, repetidos y faltantes.
+
+    cd backend && python -m pytest tests
+"""
+import csv
+import hashlib
+import io
+import zipfile
+
+from werkzeug.datastructures import FileStorage
+
+import main
+from main import Garantias, HistorialPlaca, Placas, Unidades, db
+
+
+def _leer_zip(respuesta):
+    with zipfile.ZipFile(io.BytesIO(respuesta.data)) as archivo_zip:
+        nombres = set(archivo_zip.namelist())
+        contenidos = {n: archivo_zip.read(n) for n in nombres}
+    manifiesto = list(csv.DictReader(io.StringIO(contenidos.pop("manifiesto.csv").decode("utf-8-sig"))))
+    return contenidos, manifiesto
+
+
+def test_expediente_de_unidad_con_manifiesto(cliente_app, almacen):
+    foto = main.guardar_blob(FileStorage(stream=io.BytesIO(b"foto de la unidad"), filename="foto.txt"))
+    carpeta = almacen / "uploads" / "garantias"
+    carpeta.mkdir(parents=True)
+    (carpeta / "poliza.pdf").write_bytes(b"%PDF poliza anterior")
+
+    db.session.add_all([
+        Unidades(id_unidad=901, marca="Marca", vehiculo="Expediente", id_empresa=1, url_foto=foto),
+        Unidades(id_unidad=902, marca="Marca", vehiculo="Otra", id_empresa=1, url_foto=foto),
+        Placas(id_placa=901, id_unidad=901, placa="EXP901", url_placa_frontal=foto),
+        HistorialPlaca(id_placa=901, id_unidad=901, placa="EXP901",
+                       url_comprobante_pago="uploads/placas/no_esta.pdf"),
+        Garantias(id_garantia=901, id_unidad=901, url_poliza="/uploads/garantias/poliza.pdf"),
+    ])
+    db.session.commit()
+
+    respuesta = cliente_app.get("/api/unidades/901/expediente.zip")
+    assert respuesta.status_code == 200
+    assert respuesta.headers["Content-Disposition"] == 'attachment; filename="expediente_unidad_901.zip"'
+    contenidos, manifiesto = _leer_zip(respuesta)
+
+    assert contenidos == {
+        "unidad_901/unidad/foto_901.txt": b"foto de la unidad",
+        "unidad_901/polizas/poliza_901.pdf": b"%PDF poliza anterior",
+    }
+    assert sorted(r["columna"] for r in manifiesto) == [
+        "url_comprobante_pago", "url_foto", "url_placa_frontal", "url_poliza"]
+    por_columna = {r["columna"]: r for r in manifiesto}
+    assert all(r["id_unidad"] == "901" for r in manifiesto)
+
+    assert por_columna["url_foto"]["estado"] == "incluido"
+    assert por_columna["url_foto"]["sha256"] == main.sha_de_url(foto)
+    # El mismo blob en otra fila no se vuelve a meter: apunta a la primera entrada
+    assert por_columna["url_placa_frontal"]["estado"] == "repetido"
+    assert por_columna["url_placa_frontal"]["archivo"] == "unidad_901/unidad/foto_901.txt"
+    assert por_columna["url_comprobante_pago"]["estado"] == "faltante"
+    assert por_columna["url_comprobante_pago"]["tabla"] == HistorialPlaca.__tablename__
+    assert por_columna["url_poliza"]["sha256"] == hashlib.sha256(b"%PDF poliza anterior").hexdigest()
+    assert por_columna["url_poliza"]["tamano"] == str(len(b"%PDF poliza anterior"))
+
+
+def test_expediente_de_unidad_inexistente(cliente_app, almacen):
+    assert cliente_app.get("/api/unidades/999999/expediente.zip").status_code == 404
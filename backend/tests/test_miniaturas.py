@@ -0,0 +1,44 @@
+"""Miniaturas: se generan junto al original, se marcan en blobs y se exponen en to_dict.
+
+    cd backend && python -m pytest tests
+"""
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import main
+from main import Blob, db
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _imagen(lado=800):
+    contenido = io.BytesIO()
+    Image.new("RGB", (lado, lado // 2), (200, 30, 60)).save(contenido, "PNG")
+    return FileStorage(stream=io.BytesIO(contenido.getvalue()), filename="foto.png")
+
+
+def test_miniatura_se_genera_y_marca_el_blob(cliente_app, almacen, monkeypatch):
+    monkeypatch.setattr(main, "encolar_miniatura", lambda url: None)  # se genera aquí, no en un hilo
+    url = main.guardar_blob(_imagen())
+    assert main.miniatura_url(url) is None
+
+    miniatura = main.generar_miniatura(url)
+    assert miniatura == url + ".thumb.webp"
+    with Image.open(main.ruta_absoluta(miniatura)) as vista:
+        assert vista.format == "WEBP" and max(vista.size) == main.MINIATURA_LADO
+
+    assert db.session.get(Blob, main.sha_de_url(url)).miniatura == ".thumb.webp"
+    assert main.miniatura_url(url) == miniatura
+    unidad = main.Unidades(id_unidad=801, marca="Marca", vehiculo="Miniatura", id_empresa=1, url_foto=url)
+    assert main.campos_miniatura(unidad, ("url_foto",)) == {"foto_thumb_url": miniatura}
+
+
+def test_sin_archivo_o_tipo_sin_miniatura(cliente_app, almacen):
+    url = main.guardar_blob(FileStorage(stream=io.BytesIO(b"texto"), filename="nota.txt"))
+    assert main.generar_miniatura(url) is None
+    assert main.miniatura_url(url) is None
+    assert main.generar_miniatura("uploads/blobs/00/" + "0" * 64 + ".png") is None
+    assert not os.path.exists(main.ruta_absoluta(url + ".thumb.webp"))
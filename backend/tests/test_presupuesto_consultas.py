@@ -0,0 +1,118 @@
+"""Las rutas con @presupuesto_consultas no deben pasarse de su límite de sentencias SQL.
+
+Se corre contra una base SQLite temporal con una flotilla pequeña, así que no toca la
+base configurada en .env:
+
+    cd backend && python -m pytest tests
+"""
+import os
+import random
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+
+import pytest
+
+_carpeta = tempfile.mkdtemp(prefix="presupuestos_")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_carpeta, "pruebas.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from main import (  # noqa: E402
+    Alerta, FallaMecanica, LugarReparacion, MarcasPiezas, Piezas, PresupuestoExcedido,
+    SolicitudFalla, SolicitudFallaMensajes, TiposMantenimiento, app, db, urls_con_presupuesto,
+)
+
+UNIDADES = 12
+CHOFERES = 4
+# Los usuarios chofer van después de los dos administradores de la flotilla sintética
+ID_USUARIO_CHOFER = 3
+
+
+@pytest.fixture(scope="module")
+def cliente():
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        main._generar_flotilla(UNIDADES, CHOFERES, 2, random.Random(1))
+        db.session.add_all([
+            Piezas(id_pieza=1, nombre_pieza="Balatas"),
+            Piezas(id_pieza=2, nombre_pieza="Clutch"),
+            MarcasPiezas(id_marca=1, nombre_marca="Marca A"),
+            LugarReparacion(id_lugar=1, nombre_lugar="Taller"),
+            TiposMantenimiento(nombre_tipo="Afinación"),
+        ])
+        for u in range(1, UNIDADES + 1):
+            # Varias filas por chofer, para que un N+1 se note aunque la base sea pequeña
+            id_usuario = (u - 1) % CHOFERES + ID_USUARIO_CHOFER
+            db.session.add(SolicitudFalla(id_unidad=u, id_pieza=u % 2 + 1, id_marca=1, tipo_servicio="Correctivo",
+                                          id_chofer=id_usuario))
+            db.session.add(FallaMecanica(id_unidad=u, id_pieza=u % 2 + 1, id_marca=1, id_lugar=1,
+                                         tipo_servicio="Correctivo", fecha_falla=datetime.now()))
+            db.session.add(Alerta(id_unidad=u, tipo_alerta="prueba", descripcion=f"Alerta {u}",
+                                  detalle={"id_chofer": id_usuario}))
+        db.session.flush()
+        db.session.add(SolicitudFallaMensajes(id_solicitud=1, id_usuario=1, mensaje="Hola"))
+        db.session.commit()
+    yield app.test_client()
+    with app.app_context():
+        db.drop_all()
+
+
+def _valores_de_ruta():
+    # Cualquier parámetro de ruta que no esté aquí recibe 1
+    valores = defaultdict(lambda: 1)
+    valores.update(id_chofer=ID_USUARIO_CHOFER, id_usuario=ID_USUARIO_CHOFER, user_id=ID_USUARIO_CHOFER)
+    return valores
+
+
+with app.app_context():
+    URLS = urls_con_presupuesto(_valores_de_ruta())
+
+
+# Rutas de prueba: se registran al importar (Flask no deja agregar rutas después de la
+# primera petición) y después de calcular URLS para no mezclarlas con las reales.
+@app.route("/_prueba/n_mas_1")
+@main.presupuesto_consultas(1)
+def _n_mas_1():
+    for pieza in Piezas.query.all():
+        db.session.get(MarcasPiezas, pieza.id_pieza)  # una consulta por fila
+    return {}
+
+
+@app.route("/_prueba/stream")
+@main.presupuesto_consultas(1)
+def _n_mas_1_stream():
+    def generar():
+        for pieza in Piezas.query.all():
+            yield str(MarcasPiezas.query.filter_by(id_marca=pieza.id_pieza).count())
+    return main.Response(main.stream_with_context(generar()))
+
+
+@pytest.mark.parametrize("url", URLS)
+@pytest.mark.parametrize("stream", [False, True], ids=["normal", "stream"])
+def test_ruta_dentro_del_presupuesto(cliente, url, stream):
+    try:
+        respuesta = cliente.get(url, query_string={"stream": "1"} if stream else None)
+        # En streaming las consultas ocurren al consumir el cuerpo; el límite se revisa al final
+        respuesta.get_data()
+    except PresupuestoExcedido as e:
+        pytest.fail(str(e))
+    assert respuesta.status_code < 500, respuesta.get_data(as_text=True)
+
+
+def test_detecta_n_mas_1(cliente):
+    with pytest.raises(PresupuestoExcedido):
+        cliente.get("/_prueba/n_mas_1")
+
+
+def test_detecta_exceso_en_streaming(cliente):
+    respuesta = cliente.get("/_prueba/stream")
+    with pytest.raises(PresupuestoExcedido):
+        respuesta.get_data()
+
+
+def test_las_rutas_con_parametros_estan_cubiertas():
+    assert any("/solicitudes/chofer/" in u for u in URLS)
+    assert any("/fallas/chofer/" in u for u in URLS)
@@ -0,0 +1,73 @@
+"""Servicio de uploads/: ETag, 304, Range, caché y archivos que no se publican.
+
+    cd backend && python -m pytest tests
+"""
+import io
+
+from werkzeug.datastructures import FileStorage
+
+import main
+
+CONTENIDO = b"0123456789" * 100
+
+
+def _blob(contenido=CONTENIDO, nombre="documento.txt"):
+    return main.guardar_blob(FileStorage(stream=io.BytesIO(contenido), filename=nombre))
+
+
+def test_blob_con_etag_y_cache_inmutable(cliente_app, almacen):
+    url = _blob()
+    respuesta = cliente_app.get("/" + url)
+    assert respuesta.status_code == 200
+    assert respuesta.data == CONTENIDO
+    assert respuesta.headers["ETag"] == f'"{main.sha_de_url(url)}"'
+    assert respuesta.headers["Cache-Control"] == main.CACHE_INMUTABLE
+    assert respuesta.headers["Accept-Ranges"] == "bytes"
+
+
+def test_if_none_match_regresa_304(cliente_app, almacen):
+    url = _blob()
+    etag = cliente_app.get("/" + url).headers["ETag"]
+    respuesta = cliente_app.get("/" + url, headers={"If-None-Match": etag})
+    assert respuesta.status_code == 304
+    assert respuesta.data == b""
+
+
+def test_range_regresa_206_parcial(cliente_app, almacen):
+    url = _blob()
+    respuesta = cliente_app.get("/" + url, headers={"Range": "bytes=10-19"})
+    assert respuesta.status_code == 206
+    assert respuesta.data == CONTENIDO[10:20]
+    assert respuesta.headers["Content-Range"] == f"bytes 10-19/{len(CONTENIDO)}"
+
+
+def test_archivo_anterior_se_revalida(cliente_app, almacen):
+    carpeta = almacen / "uploads" / "unidades"
+    carpeta.mkdir(parents=True)
+    (carpeta / "foto_vieja.txt").write_bytes(b"anterior")
+
+    respuesta = cliente_app.get("/uploads/unidades/foto_vieja.txt")
+    assert respuesta.status_code == 200
+    assert respuesta.headers["Cache-Control"] == main.CACHE_REVALIDAR
+    assert cliente_app.get("/uploads/unidades/foto_vieja.txt",
+                           headers={"If-None-Match": respuesta.headers["ETag"]}).status_code == 304
+
+
+def test_descarga_como_adjunto(cliente_app, almacen):
+    url = _blob()
+    respuesta = cliente_app.get("/api/descargar/" + url[len("uploads/"):])
+    assert respuesta.status_code == 200
+    assert respuesta.headers["Content-Disposition"].startswith("attachment")
+
+
+def test_parciales_y_subidas_no_se_sirven(cliente_app, almacen):
+    (almacen / "uploads" / "blobs").mkdir(parents=True)
+    (almacen / "uploads" / "blobs" / "tmp123.parcial").write_bytes(b"a medias")
+    (almacen / "uploads" / "subidas").mkdir(parents=True)
+    (almacen / "uploads" / "subidas" / "abc.mp4").write_bytes(b"en curso")
+
+    assert cliente_app.get("/uploads/blobs/tmp123.parcial").status_code == 404
+    assert cliente_app.get("/uploads/subidas/abc.mp4").status_code == 404
+    assert cliente_app.get("/api/descargar/subidas/abc.mp4").status_code == 404
+    assert cliente_app.get("/uploads/no_existe.txt").status_code == 404
+    assert cliente_app.get("/uploads/../main.py").status_code == 404
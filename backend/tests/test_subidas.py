@@ -0,0 +1,105 @@
+"""Subidas por partes: Content-Range, reanudación, truncado de partes cortas y sha256.
+
+    cd backend && python -m pytest tests
+"""
+import hashlib
+import os
+
+import main
+
+CONTENIDO = bytes(range(256)) * 40  # 10240 bytes
+
+
+def _iniciar(cliente, tamano=len(CONTENIDO)):
+    respuesta = cliente.post("/api/subidas", json={"nombre": "video.mp4", "tamano": tamano})
+    assert respuesta.status_code == 201
+    return respuesta.get_json()["id_subida"]
+
+
+def _parte(cliente, id_subida, inicio, fin, cuerpo=None, total=len(CONTENIDO)):
+    return cliente.put(
+        f"/api/subidas/{id_subida}",
+        data=CONTENIDO[inicio:fin + 1] if cuerpo is None else cuerpo,
+        headers={"Content-Range": f"bytes {inicio}-{fin}/{total}"},
+    )
+
+
+def test_subida_completa_llega_al_almacen(cliente_app, almacen):
+    id_subida = _iniciar(cliente_app)
+    assert _parte(cliente_app, id_subida, 0, 4095).get_json()["recibidos"] == 4096
+    assert _parte(cliente_app, id_subida, 4096, len(CONTENIDO) - 1).status_code == 200
+
+    sha256 = hashlib.sha256(CONTENIDO).hexdigest()
+    respuesta = cliente_app.post(f"/api/subidas/{id_subida}/completar", json={"sha256": sha256})
+    assert respuesta.status_code == 200
+    estado = respuesta.get_json()
+    assert estado["estado"] == "completa" and main.sha_de_url(estado["url"]) == sha256
+    with open(main.ruta_absoluta(estado["url"]), "rb") as f:
+        assert f.read() == CONTENIDO
+    assert not os.path.exists(main._ruta_subida(id_subida))
+    assert id_subida not in main._hash_subidas
+
+
+def test_parte_fuera_de_orden_regresa_409_con_lo_recibido(cliente_app, almacen):
+    id_subida = _iniciar(cliente_app)
+    _parte(cliente_app, id_subida, 0, 1023)
+
+    respuesta = _parte(cliente_app, id_subida, 2048, 3071)
+    assert respuesta.status_code == 409
+    assert respuesta.get_json()["recibidos"] == 1024
+    # Reanudar desde donde dijo el servidor
+    assert _parte(cliente_app, id_subida, 1024, 2047).get_json()["recibidos"] == 2048
+
+
+def test_rango_fuera_del_tamano_o_parte_grande_regresa_416(cliente_app, almacen, monkeypatch):
+    id_subida = _iniciar(cliente_app)
+    assert _parte(cliente_app, id_subida, 0, 9, total=len(CONTENIDO) + 1).status_code == 416
+    assert _parte(cliente_app, id_subida, 0, len(CONTENIDO)).status_code == 416
+
+    monkeypatch.setattr(main, "TAMANO_MAX_PARTE", 1024)
+    assert _parte(cliente_app, id_subida, 0, 1024).status_code == 416
+    assert cliente_app.get(f"/api/subidas/{id_subida}").get_json()["recibidos"] == 0
+
+
+def test_parte_corta_se_descarta_y_trunca_el_parcial(cliente_app, almacen):
+    id_subida = _iniciar(cliente_app)
+    _parte(cliente_app, id_subida, 0, 1023)
+
+    respuesta = _parte(cliente_app, id_subida, 1024, 2047, cuerpo=CONTENIDO[1024:1500])
+    assert respuesta.status_code == 400
+    assert respuesta.get_json()["recibidos"] == 1024
+    assert os.path.getsize(main._ruta_subida(id_subida)) == 1024
+    # El hash en memoria ya no cubre el parcial; al completar se relee del disco
+    assert id_subida not in main._hash_subidas
+
+    _parte(cliente_app, id_subida, 1024, len(CONTENIDO) - 1)
+    respuesta = cliente_app.post(f"/api/subidas/{id_subida}/completar",
+                                 json={"sha256": hashlib.sha256(CONTENIDO).hexdigest()})
+    assert respuesta.status_code == 200
+
+
+def test_sha256_distinto_regresa_422(cliente_app, almacen):
+    id_subida = _iniciar(cliente_app)
+    _parte(cliente_app, id_subida, 0, len(CONTENIDO) - 1)
+
+    respuesta = cliente_app.post(f"/api/subidas/{id_subida}/completar", json={"sha256": "0" * 64})
+    assert respuesta.status_code == 422
+    assert respuesta.get_json()["sha256"] == hashlib.sha256(CONTENIDO).hexdigest()
+    assert cliente_app.get(f"/api/subidas/{id_subida}").get_json()["estado"] == "en_curso"
+
+
+def test_hash_de_subidas_abandonadas_se_descarta(cliente_app, almacen, monkeypatch):
+    abandonada = _iniciar(cliente_app)
+    _parte(cliente_app, abandonada, 0, 1023)
+    assert abandonada in main._hash_subidas
+
+    monkeypatch.setattr(main, "SUBIDA_HASH_TTL_SEGUNDOS", -1)
+    _iniciar(cliente_app)
+    assert abandonada not in main._hash_subidas
+
+    # Sin el hash en memoria la subida sigue: se recalcula al completar
+    monkeypatch.setattr(main, "SUBIDA_HASH_TTL_SEGUNDOS", 3600)
+    _parte(cliente_app, abandonada, 1024, len(CONTENIDO) - 1)
+    respuesta = cliente_app.post(f"/api/subidas/{abandonada}/completar",
+                                 json={"sha256": hashlib.sha256(CONTENIDO).hexdigest()})
+    assert respuesta.status_code == 200
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useContext } from "react";
 import Swal from "sweetalert2";
 import { API_URL } from "../config";
+import { subirPorPartes, usarSubidaPorPartes } from "../subidas";
 import { NotificationContext } from "./NotificationContext"; 
 import Modal from "./Modal"; // Importa tu modal existente
 import "./SolicitudForm.css";
@@ -143,9 +144,15 @@ export default function ListaSolicitudes() {
     formData.append("id_solicitud", id_solicitud);
     formData.append("id_usuario", usuarioId);
     if (mensaje) formData.append("mensaje", mensaje);
-    if (archivo) formData.append("archivo", archivo);
 
     try {
+      // Los videos van por partes (reanudable) y el formulario solo lleva el id de la subida
+      if (archivo && usarSubidaPorPartes(archivo)) {
+        formData.append("archivo_subida", await subirPorPartes(archivo));
+      } else if (archivo) {
+        formData.append("archivo", archivo);
+      }
+
       const res = await fetch(`${API_URL}/solicitudes_mensajes/responder`, {
         method: "POST",
         body: formData,
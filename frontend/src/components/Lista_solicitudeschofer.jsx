@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from "react";
 import Swal from "sweetalert2";
 import { API_URL } from "../config";
+import { subirPorPartes, usarSubidaPorPartes } from "../subidas";
 import "./MensajesChofer.css";
 
 export default function MensajesChoferChat() {
@@ -52,9 +53,15 @@ export default function MensajesChoferChat() {
     formData.append("id_solicitud", id_solicitud);
     formData.append("id_usuario", localStorage.getItem("usuarioId"));
     if (mensaje) formData.append("mensaje", mensaje);
-    if (archivo) formData.append("archivo", archivo);
 
     try {
+      // Los videos van por partes (reanudable) y el formulario solo lleva el id de la subida
+      if (archivo && usarSubidaPorPartes(archivo)) {
+        formData.append("archivo_subida", await subirPorPartes(archivo));
+      } else if (archivo) {
+        formData.append("archivo", archivo);
+      }
+
       const res = await fetch(`${API_URL}/solicitudes_mensajes/responder`, {
         method: "POST",
         body: formData,
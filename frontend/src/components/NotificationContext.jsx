@@ -1,5 +1,5 @@
 import React, { createContext, useState, useEffect } from "react";
-import { API_URL, BASE_URL } from "../config";
+import { API_URL } from "../config";
 
 export const NotificationContext = createContext();
 
@@ -10,76 +10,30 @@ export const NotificationProvider = ({ children }) => {
 
   const usuarioId = Number(localStorage.getItem("usuarioId"));
 
-  // === ALERTAS PENDIENTES ===
-useEffect(() => {
-  const fetchAlertas = async () => {
-    try {
-      const usuarioId = localStorage.getItem("usuarioId");
-      if (!usuarioId) return;
-
-      const res = await fetch(`${API_URL}/alertas/usuario/${usuarioId}`);
-      const data = await res.json();
-
-      // Crear un Set para combinar vehículo + tipo de alerta
-      const pendientesUnicos = new Set();
-
-      (data.alertas || []).forEach(a => {
-        if (a.estado === "pendiente" || !a.fecha_resuelta) {
-          // Asumiendo que a tiene: a.id_unidad y a.tipo_alerta
-          const key = `${a.id_unidad}-${a.tipo_alerta}`;
-          pendientesUnicos.add(key);
-        }
-      });
-
-      setAlertasPendientes(pendientesUnicos.size);
-    } catch (err) {
-      console.error("Error cargando alertas pendientes:", err);
-    }
-  };
-
-  fetchAlertas();
-  const interval = setInterval(fetchAlertas, 15000);
-  return () => clearInterval(interval);
-}, []);
-
-  // === SOLICITUDES PENDIENTES ===
+  // === CANAL DE EVENTOS (SSE) ===
+  // El backend empuja los conteos de alertas, solicitudes y mensajes solo cuando cambian;
+  // EventSource se reconecta solo si se cae la conexión.
   useEffect(() => {
-    const fetchPendientes = async () => {
-      try {
-        const res = await fetch(`${API_URL}/solicitudes`);
-        const data = await res.json();
+    if (!usuarioId) return;
 
-        const pendientesCount = data.filter(s => s.estado === "pendiente").length;
-        setPendientes(pendientesCount);
-      } catch (err) {
-        console.error(err);
-      }
-    };
-
-    fetchPendientes();
-    const interval = setInterval(fetchPendientes, 10000);
-    return () => clearInterval(interval);
-  }, []);
-
-  // === MENSAJES NUEVOS ===
-  useEffect(() => {
-    const fetchMensajesNuevos = async () => {
-      if (!usuarioId) return;
+    const eventos = new EventSource(`${API_URL}/events/usuario/${usuarioId}`);
 
+    eventos.addEventListener("resumen", (e) => {
       try {
-        const res = await fetch(`${BASE_URL}/mis_mensajes/${usuarioId}`);
-        const data = await res.json();
-
-        const nuevos = data.filter(m => m.id_usuario !== usuarioId).length;
-        setMensajesNuevos(nuevos);
+        const resumen = JSON.parse(e.data);
+        setAlertasPendientes(resumen.alertas_pendientes);
+        setPendientes(resumen.solicitudes_pendientes);
+        setMensajesNuevos(resumen.mensajes_nuevos);
       } catch (err) {
-        console.error(err);
+        console.error("Error leyendo notificaciones:", err);
       }
+    });
+
+    eventos.onerror = (err) => {
+      console.error("Canal de notificaciones desconectado, reintentando:", err);
     };
 
-    fetchMensajesNuevos();
-    const intervalMensajes = setInterval(fetchMensajesNuevos, 10000);
-    return () => clearInterval(intervalMensajes);
+    return () => eventos.close();
   }, [usuarioId]);
 
   // === PROVIDER FINAL ===
@@ -1,6 +1,7 @@
 import React, { useEffect, useState, useContext, useRef } from "react";
 import Swal from "sweetalert2";
 import { BASE_URL } from "../config";
+import { subirPorPartes, usarSubidaPorPartes } from "../subidas";
 import { NotificationContext } from "../components/NotificationContext";
 import "./MensajesChofer.css";
 
@@ -52,7 +53,12 @@ export default function MensajesChoferEpic() {
       formData.append("id_solicitud", id_solicitud);
       formData.append("id_usuario", usuarioId);
       if (mensaje) formData.append("mensaje", mensaje);
-      if (archivo) formData.append("archivo", archivo);
+      // Los videos van por partes (reanudable) y el formulario solo lleva el id de la subida
+      if (archivo && usarSubidaPorPartes(archivo)) {
+        formData.append("archivo_subida", await subirPorPartes(archivo));
+      } else if (archivo) {
+        formData.append("archivo", archivo);
+      }
 
       const res = await fetch(`${BASE_URL}/solicitudes_mensajes/responder`, {
         method: "POST",
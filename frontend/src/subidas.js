@@ -0,0 +1,55 @@
+// src/subidas.js
+// Subida por partes (reanudable) contra /api/subidas para videos grandes desde el celular.
+// Regresa el id_subida que los formularios mandan como <campo>_subida en lugar del archivo.
+import { API_URL } from "./config";
+
+const TAMANO_PARTE = 4 * 1024 * 1024;
+const REINTENTOS = 5;
+const EXTENSIONES_POR_PARTES = ["mp4", "webm", "ogg"];
+
+export const usarSubidaPorPartes = (archivo) =>
+  EXTENSIONES_POR_PARTES.includes(archivo.name.split(".").pop().toLowerCase());
+
+const leerJson = async (res) => {
+  const data = await res.json().catch(() => ({}));
+  if (!res.ok && res.status !== 409) throw new Error(data.error || "Error en la subida");
+  return data;
+};
+
+export async function subirPorPartes(archivo) {
+  let estado = await leerJson(await fetch(`${API_URL}/api/subidas`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ nombre: archivo.name, tamano: archivo.size }),
+  }));
+  const id = estado.id_subida;
+  let fallos = 0;
+  let reanudar = false;
+
+  while (reanudar || estado.recibidos < archivo.size) {
+    try {
+      if (reanudar) {
+        // Tras un corte se pregunta cuántos bytes llegaron antes de seguir
+        estado = await leerJson(await fetch(`${API_URL}/api/subidas/${id}`));
+        reanudar = false;
+        continue;
+      }
+      const inicio = estado.recibidos;
+      const fin = Math.min(inicio + TAMANO_PARTE, archivo.size) - 1;
+      // Con 409 el servidor regresa cuántos bytes tiene y se sigue desde ahí
+      estado = await leerJson(await fetch(`${API_URL}/api/subidas/${id}`, {
+        method: "PUT",
+        headers: { "Content-Range": `bytes ${inicio}-${fin}/${archivo.size}` },
+        body: archivo.slice(inicio, fin + 1),
+      }));
+      fallos = 0;
+    } catch (err) {
+      if (++fallos > REINTENTOS) throw err;
+      await new Promise((r) => setTimeout(r, 1000 * 2 ** fallos));
+      reanudar = true;
+    }
+  }
+
+  await leerJson(await fetch(`${API_URL}/api/subidas/${id}/completar`, { method: "POST" }));
+  return id;
+}